@@ -6,19 +6,29 @@ Trades BRETT using the following strategy:
 - When dYdX order fills, immediately execute opposite market order on Hyperliquid
 - Modular algorithm design for easy modification
 
-Dependencies: requests, asyncio, websockets (pip install requests asyncio websockets)
+Dependencies: aiohttp, orjson, msgspec, numpy, asyncio, websockets (pip install aiohttp orjson msgspec numpy asyncio websockets)
+Optional: uvloop for a faster event loop (pip install uvloop)
 """
 
-import requests
+import aiohttp
+import orjson
+import msgspec
+import numpy as np
 import asyncio
 import websockets
 import json
 import time
 import logging
 from typing import Dict, Tuple, Optional, Callable
+from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from enum import Enum
 
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -28,6 +38,31 @@ TRADING_PAIR = "BRETT"
 DYDX_BASE = "https://indexer.dydx.trade/v4"
 HL_BASE = "https://api.hyperliquid.xyz/info"
 HL_TRADE_BASE = "https://api.hyperliquid.xyz/exchange"
+DYDX_WS = "wss://indexer.dydx.trade/v4/ws"
+HL_WS = "wss://api.hyperliquid.xyz/ws"
+
+# Shared HTTP session, kept open for the process lifetime so that every REST
+# call reuses a pooled keep-alive connection instead of a fresh TCP+TLS handshake
+_session: Optional[aiohttp.ClientSession] = None
+
+def get_session() -> aiohttp.ClientSession:
+    """Return the shared aiohttp session, creating it on first use"""
+    global _session
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=64, limit_per_host=16, ttl_dns_cache=300, keepalive_timeout=60
+        )
+        _session = aiohttp.ClientSession(
+            connector=connector, timeout=aiohttp.ClientTimeout(total=5)
+        )
+    return _session
+
+async def close_session():
+    """Close the shared aiohttp session"""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
 
 class OrderSide(Enum):
     BUY = "BUY"
@@ -37,52 +72,86 @@ class OrderType(Enum):
     LIMIT = "LIMIT"
     MARKET = "MARKET"
 
-@dataclass
-class OrderBookLevel:
+@dataclass(slots=True, frozen=True)
+class OrderBook:
+    """Orderbook stored as parallel float64 arrays per side, best level first"""
+    bid_px: np.ndarray
+    bid_sz: np.ndarray
+    ask_px: np.ndarray
+    ask_sz: np.ndarray
+    timestamp: int  # time.monotonic_ns() when the book was received
+
+# REST orderbook schemas, decoded by msgspec straight from the response bytes
+class DydxLevel(msgspec.Struct):
     price: float
     size: float
 
-@dataclass
-class OrderBook:
-    bids: list[OrderBookLevel]
-    asks: list[OrderBookLevel]
-    timestamp: float
+class DydxBook(msgspec.Struct):
+    bids: list[DydxLevel]
+    asks: list[DydxLevel]
+
+class HlLevel(msgspec.Struct):
+    price: float = msgspec.field(name="px")
+    size: float = msgspec.field(name="sz")
+
+class HlBook(msgspec.Struct):
+    levels: tuple[list[HlLevel], list[HlLevel]]  # (bids, asks)
+
+# strict=False lets the exchanges' decimal strings decode into float fields
+_DYDX_BOOK_DECODER = msgspec.json.Decoder(DydxBook, strict=False)
+_HL_BOOK_DECODER = msgspec.json.Decoder(HlBook, strict=False)
+
+def _levels_to_arrays(levels: list) -> Tuple[np.ndarray, np.ndarray]:
+    """Convert a list of decoded book levels into (prices, sizes) float64 arrays"""
+    count = len(levels)
+    prices = np.fromiter((level.price for level in levels), dtype=np.float64, count=count)
+    sizes = np.fromiter((level.size for level in levels), dtype=np.float64, count=count)
+    return prices, sizes
 
 class PricingAlgorithm:
     """Modular pricing algorithm for determining bid/ask levels"""
     
+    # Strategies that only look at the best bid/ask, not deeper levels
+    TOP_OF_BOOK_STRATEGIES = ("best_bid_ask", "mid_price_offset")
+    
     def __init__(self, name: str = "best_bid_ask"):
         self.name = name
+        
+        # Resolve the strategy once so pricing does not compare names on every call
+        strategies = {
+            "best_bid_ask": self._best_bid_ask_strategy,
+            "mid_price_offset": self._mid_price_offset_strategy
+        }
+        if name not in strategies:
+            raise ValueError(f"Unknown pricing algorithm: {name}")
+        self._strategy = strategies[name]
+        
+        # Whether the strategy can be priced from the best bid/ask alone
+        self.top_of_book_only = name in self.TOP_OF_BOOK_STRATEGIES
     
     def calculate_bid_ask(self, orderbook: OrderBook) -> Tuple[float, float]:
         """
         Calculate bid and ask prices based on current orderbook
         Returns: (bid_price, ask_price)
         """
-        if self.name == "best_bid_ask":
-            return self._best_bid_ask_strategy(orderbook)
-        elif self.name == "mid_price_offset":
-            return self._mid_price_offset_strategy(orderbook)
-        else:
-            raise ValueError(f"Unknown pricing algorithm: {self.name}")
-    
-    def _best_bid_ask_strategy(self, orderbook: OrderBook) -> Tuple[float, float]:
-        """Simple strategy: place orders at current best bid/ask"""
-        if not orderbook.bids or not orderbook.asks:
+        if orderbook.bid_px.size == 0 or orderbook.ask_px.size == 0:
             raise ValueError("Orderbook has no bids or asks")
         
-        best_bid = orderbook.bids[0].price
-        best_ask = orderbook.asks[0].price
-        
+        return self.calculate_bid_ask_from_top(orderbook.bid_px[0], orderbook.ask_px[0])
+    
+    def calculate_bid_ask_from_top(self, best_bid: float, best_ask: float) -> Tuple[float, float]:
+        """
+        Calculate bid and ask prices from the current best bid/ask
+        Returns: (bid_price, ask_price)
+        """
+        return self._strategy(best_bid, best_ask)
+    
+    def _best_bid_ask_strategy(self, best_bid: float, best_ask: float) -> Tuple[float, float]:
+        """Simple strategy: place orders at current best bid/ask"""
         return best_bid, best_ask
     
-    def _mid_price_offset_strategy(self, orderbook: OrderBook) -> Tuple[float, float]:
+    def _mid_price_offset_strategy(self, best_bid: float, best_ask: float) -> Tuple[float, float]:
         """Strategy: place orders at mid price with small offset"""
-        if not orderbook.bids or not orderbook.asks:
-            raise ValueError("Orderbook has no bids or asks")
-        
-        best_bid = orderbook.bids[0].price
-        best_ask = orderbook.asks[0].price
         mid_price = (best_bid + best_ask) / 2
         
         # Small offset from mid price
@@ -93,6 +162,145 @@ class PricingAlgorithm:
         
         return bid_price, ask_price
 
+class OrderBookFeed(ABC):
+    """Maintains an in-memory orderbook from a WebSocket L2 subscription"""
+    
+    url = ""
+    
+    def __init__(self, symbol: str, reconnect_delay: float = 5.0):
+        self.symbol = symbol
+        self.reconnect_delay = reconnect_delay
+        self.bids: Dict[float, float] = {}
+        self.asks: Dict[float, float] = {}
+        self.timestamp = 0
+        self.updated = asyncio.Event()
+    
+    async def run(self):
+        """Subscribe to the book and apply updates until cancelled, reconnecting after errors or closes"""
+        while True:
+            try:
+                async with websockets.connect(self.url) as ws:
+                    await ws.send(json.dumps(self._subscribe_message()))
+                    async for message in ws:
+                        if self._handle_message(orjson.loads(message)):
+                            self.timestamp = time.monotonic_ns()
+                            self.updated.set()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in {self.symbol} orderbook feed: {e}")
+            else:
+                logger.warning(f"{self.symbol} orderbook feed closed by server, reconnecting")
+            # Drop the stale book so pricing backs off until the next snapshot arrives
+            self._clear()
+            await asyncio.sleep(self.reconnect_delay)
+    
+    async def wait_for_update(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until the book has changed since the last call, or until timeout
+        Returns: True if the book changed, False on timeout
+        """
+        try:
+            await asyncio.wait_for(self.updated.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        self.updated.clear()
+        return True
+    
+    def is_ready(self) -> bool:
+        """Whether the book has both bids and asks to price from"""
+        return bool(self.bids) and bool(self.asks)
+    
+    def top_of_book(self) -> Tuple[float, float]:
+        """
+        Return the current best bid/ask without building a snapshot
+        Returns: (best_bid, best_ask)
+        """
+        if not self.is_ready():
+            raise ValueError("Orderbook has no bids or asks")
+        return max(self.bids), min(self.asks)
+    
+    def snapshot(self) -> OrderBook:
+        """Return the current book, best levels first"""
+        bid_px = sorted(self.bids, reverse=True)
+        ask_px = sorted(self.asks)
+        return OrderBook(
+            bid_px=np.array(bid_px, dtype=np.float64),
+            bid_sz=np.array([self.bids[price] for price in bid_px], dtype=np.float64),
+            ask_px=np.array(ask_px, dtype=np.float64),
+            ask_sz=np.array([self.asks[price] for price in ask_px], dtype=np.float64),
+            timestamp=self.timestamp
+        )
+    
+    def _clear(self):
+        """Drop both sides of the book"""
+        self.bids.clear()
+        self.asks.clear()
+    
+    @staticmethod
+    def _apply(side: Dict[float, float], levels):
+        """Apply (price, size) updates to one side of the book; size 0 removes the level"""
+        for price, size in levels:
+            price, size = float(price), float(size)
+            if size == 0:
+                side.pop(price, None)
+            else:
+                side[price] = size
+    
+    @abstractmethod
+    def _subscribe_message(self) -> Dict:
+        """Return the subscription request sent after connecting"""
+    
+    @abstractmethod
+    def _handle_message(self, message: Dict) -> bool:
+        """Apply a decoded message to the book; returns True if the book changed"""
+
+class DYDXOrderBookFeed(OrderBookFeed):
+    """dYdX v4 indexer `v4_orderbook` channel"""
+    
+    url = DYDX_WS
+    
+    def _subscribe_message(self) -> Dict:
+        return {"type": "subscribe", "channel": "v4_orderbook", "id": self.symbol}
+    
+    def _handle_message(self, message: Dict) -> bool:
+        msg_type = message.get("type")
+        contents = message.get("contents", {})
+        
+        if msg_type == "subscribed":
+            # Initial snapshot: levels are {"price": ..., "size": ...} objects
+            self._clear()
+            self._apply(self.bids, ((level["price"], level["size"]) for level in contents.get("bids", [])))
+            self._apply(self.asks, ((level["price"], level["size"]) for level in contents.get("asks", [])))
+            return True
+        
+        if msg_type == "channel_data":
+            # Deltas: levels are [price, size] pairs
+            self._apply(self.bids, contents.get("bids", []))
+            self._apply(self.asks, contents.get("asks", []))
+            return True
+        
+        return False
+
+class HyperliquidOrderBookFeed(OrderBookFeed):
+    """Hyperliquid `l2Book` subscription"""
+    
+    url = HL_WS
+    
+    def _subscribe_message(self) -> Dict:
+        return {"method": "subscribe", "subscription": {"type": "l2Book", "coin": self.symbol}}
+    
+    def _handle_message(self, message: Dict) -> bool:
+        if message.get("channel") != "l2Book":
+            return False
+        
+        # Hyperliquid pushes a full snapshot on every update
+        bids_data, asks_data = message["data"]["levels"]
+        self._clear()
+        self._apply(self.bids, ((level["px"], level["sz"]) for level in bids_data))
+        self._apply(self.asks, ((level["px"], level["sz"]) for level in asks_data))
+        return True
+
 class DYDXTrader:
     """Handles dYdX trading operations"""
     
@@ -101,25 +309,46 @@ class DYDXTrader:
         self.api_secret = api_secret
         self.passphrase = passphrase
         self.base_url = "https://api.dydx.exchange"
+    
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        return get_session()
         
-    def get_orderbook(self, ticker: str) -> OrderBook:
+    async def get_orderbook(self, ticker: str) -> OrderBook:
         """Get current orderbook for a ticker"""
         url = f"{DYDX_BASE}/orderbooks/perpetualMarket/{ticker}"
         try:
-            response = requests.get(url, timeout=5)
-            response.raise_for_status()
-            data = response.json()
+            async with self.session.get(url) as response:
+                response.raise_for_status()
+                book = _DYDX_BOOK_DECODER.decode(await response.read())
             
-            bids = [OrderBookLevel(float(level["price"]), float(level["size"])) 
-                   for level in data["bids"]]
-            asks = [OrderBookLevel(float(level["price"]), float(level["size"])) 
-                   for level in data["asks"]]
+            bid_px, bid_sz = _levels_to_arrays(book.bids)
+            ask_px, ask_sz = _levels_to_arrays(book.asks)
             
-            return OrderBook(bids, asks, time.time())
+            return OrderBook(bid_px, bid_sz, ask_px, ask_sz, time.monotonic_ns())
         except Exception as e:
             logger.error(f"Error getting dYdX orderbook: {e}")
             raise
     
+    async def get_top_of_book(self, ticker: str) -> Tuple[float, float]:
+        """
+        Get best bid/ask for a ticker without converting the full orderbook
+        Returns: (best_bid, best_ask)
+        """
+        url = f"{DYDX_BASE}/orderbooks/perpetualMarket/{ticker}"
+        try:
+            async with self.session.get(url) as response:
+                response.raise_for_status()
+                book = _DYDX_BOOK_DECODER.decode(await response.read())
+            
+            if not book.bids or not book.asks:
+                raise ValueError("Orderbook has no bids or asks")
+            
+            return book.bids[0].price, book.asks[0].price
+        except Exception as e:
+            logger.error(f"Error getting dYdX top of book: {e}")
+            raise
+    
     def place_order(self, ticker: str, side: OrderSide, order_type: OrderType, 
                    size: float, price: Optional[float] = None) -> Dict:
         """Place an order on dYdX"""
@@ -142,6 +371,24 @@ class DYDXTrader:
         # Mock implementation
         return True
     
+    def replace_order(self, old_order_id: str, ticker: str, side: OrderSide,
+                      size: float, price: float) -> Dict:
+        """Cancel an order and place its replacement atomically on dYdX"""
+        # This is a placeholder - actual implementation would broadcast MsgCancelOrder and
+        # MsgPlaceOrder together in one signed transaction via the dYdX v4 client
+        logger.info(f"Replacing dYdX order {old_order_id} with {side.value} LIMIT order: {ticker}, size: {size}, price: {price}")
+        
+        # Mock response for now
+        return {
+            "order_id": f"dydx_{int(time.time())}",
+            "replaced_order_id": old_order_id,
+            "status": "PENDING",
+            "side": side.value,
+            "type": OrderType.LIMIT.value,
+            "size": size,
+            "price": price
+        }
+    
     def get_order_status(self, order_id: str) -> Dict:
         """Get status of an order"""
         # Mock implementation
@@ -150,6 +397,13 @@ class DYDXTrader:
             "status": "FILLED",  # Mock as filled
             "filled_size": 1.0
         }
+    
+    def get_open_orders(self, ticker: str) -> list[Dict]:
+        """Get all open orders for a ticker in a single request"""
+        # This is a placeholder - actual implementation would query the indexer's
+        # /orders endpoint for the subaccount with status=OPEN
+        # Mock implementation: no orders open, so every tracked order is checked with get_order_status
+        return []
 
 class HyperliquidTrader:
     """Handles Hyperliquid trading operations"""
@@ -158,30 +412,55 @@ class HyperliquidTrader:
         self.api_key = api_key
         self.api_secret = api_secret
         self.base_url = "https://api.hyperliquid.xyz"
+    
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        return get_session()
         
-    def get_orderbook(self, coin: str) -> OrderBook:
+    async def get_orderbook(self, coin: str) -> OrderBook:
         """Get current orderbook for a coin"""
         url = f"{HL_BASE}"
         payload = {"type": "l2Book", "coin": coin}
         headers = {"Content-Type": "application/json"}
         
         try:
-            response = requests.post(url, json=payload, headers=headers, timeout=5)
-            response.raise_for_status()
-            data = response.json()
+            async with self.session.post(url, json=payload, headers=headers) as response:
+                response.raise_for_status()
+                book = _HL_BOOK_DECODER.decode(await response.read())
             
-            bids_data, asks_data = data["levels"]
+            bids_data, asks_data = book.levels
             
-            bids = [OrderBookLevel(float(level["px"]), float(level["sz"])) 
-                   for level in bids_data]
-            asks = [OrderBookLevel(float(level["px"]), float(level["sz"])) 
-                   for level in asks_data]
+            bid_px, bid_sz = _levels_to_arrays(bids_data)
+            ask_px, ask_sz = _levels_to_arrays(asks_data)
             
-            return OrderBook(bids, asks, time.time())
+            return OrderBook(bid_px, bid_sz, ask_px, ask_sz, time.monotonic_ns())
         except Exception as e:
             logger.error(f"Error getting Hyperliquid orderbook: {e}")
             raise
     
+    async def get_top_of_book(self, coin: str) -> Tuple[float, float]:
+        """
+        Get best bid/ask for a coin without converting the full orderbook
+        Returns: (best_bid, best_ask)
+        """
+        url = f"{HL_BASE}"
+        payload = {"type": "l2Book", "coin": coin}
+        headers = {"Content-Type": "application/json"}
+        
+        try:
+            async with self.session.post(url, json=payload, headers=headers) as response:
+                response.raise_for_status()
+                book = _HL_BOOK_DECODER.decode(await response.read())
+            
+            bids_data, asks_data = book.levels
+            if not bids_data or not asks_data:
+                raise ValueError("Orderbook has no bids or asks")
+            
+            return bids_data[0].price, asks_data[0].price
+        except Exception as e:
+            logger.error(f"Error getting Hyperliquid top of book: {e}")
+            raise
+    
     def place_market_order(self, coin: str, side: OrderSide, size: float) -> Dict:
         """Place a market order on Hyperliquid"""
         # This is a placeholder - actual implementation would require Hyperliquid API integration
@@ -201,15 +480,35 @@ class ArbitrageTrader:
     """Main arbitrage trading class"""
     
     def __init__(self, dydx_trader: DYDXTrader, hl_trader: HyperliquidTrader, 
-                 pricing_algorithm: PricingAlgorithm, trade_size: float = 1.0):
+                 pricing_algorithm: PricingAlgorithm, trade_size: float = 1.0,
+                 orderbook_source: str = "websocket", price_threshold: float = 0.001,
+                 tick_size: float = 0.00001, loop_interval: float = 1.0,
+                 error_retry_delay: float = 5.0):
         self.dydx_trader = dydx_trader
         self.hl_trader = hl_trader
         self.pricing_algorithm = pricing_algorithm
         self.trade_size = trade_size
         
-        # Track current orders
+        # Order prices are compared in integer ticks so the steady state needs no division
+        self.price_threshold = price_threshold
+        self._tick_inverse = 1.0 / tick_size
+        
+        # Orderbook source: live WebSocket feeds or REST polling
+        if orderbook_source not in ("websocket", "rest"):
+            raise ValueError(f"Unknown orderbook source: {orderbook_source}")
+        self.orderbook_source = orderbook_source
+        self.loop_interval = loop_interval
+        self.error_retry_delay = error_retry_delay
+        self.dydx_feed = DYDXOrderBookFeed(f"{TRADING_PAIR}-USD", reconnect_delay=error_retry_delay)
+        self.hl_feed = HyperliquidOrderBookFeed(TRADING_PAIR, reconnect_delay=error_retry_delay)
+        
+        # Track current orders, their prices in ticks and the update threshold in ticks
         self.current_bid_order = None
         self.current_ask_order = None
+        self.current_bid_tick = 0
+        self.current_ask_tick = 0
+        self._bid_threshold_ticks = 0
+        self._ask_threshold_ticks = 0
         self.is_running = False
         
     def start(self):
@@ -218,7 +517,16 @@ class ArbitrageTrader:
         self.is_running = True
         
         try:
-            asyncio.run(self._trading_loop())
+            if uvloop is not None and hasattr(asyncio, "Runner"):
+                # Run on uvloop when it is installed
+                with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+                    runner.run(self._trading_loop())
+            elif uvloop is not None:
+                # asyncio.Runner is Python 3.11+; on older versions install uvloop's policy instead
+                uvloop.install()
+                asyncio.run(self._trading_loop())
+            else:
+                asyncio.run(self._trading_loop())
         except KeyboardInterrupt:
             logger.info("Stopping arbitrage trading...")
             self.stop()
@@ -234,53 +542,150 @@ class ArbitrageTrader:
     
     async def _trading_loop(self):
         """Main trading loop"""
+        background_tasks = []
+        if self.orderbook_source == "websocket":
+            # Book updates drive re-quoting; fills are polled on their own fixed cadence
+            # so fill-check traffic does not grow with market activity
+            background_tasks = [asyncio.create_task(self.dydx_feed.run()),
+                                asyncio.create_task(self.hl_feed.run()),
+                                asyncio.create_task(self._fill_check_loop())]
+        
+        try:
+            while self.is_running:
+                try:
+                    # Get current prices and calculate new bid/ask prices
+                    if self.pricing_algorithm.top_of_book_only:
+                        # Fast path: price straight from the best bid/ask, no full orderbook
+                        books = await self._get_top_of_book()
+                    else:
+                        books = await self._get_orderbooks()
+                    
+                    if books is None:
+                        # Feed has no book yet (startup or reconnect); wait for its snapshot
+                        continue
+                    
+                    if self.pricing_algorithm.top_of_book_only:
+                        (best_bid, best_ask), hl_top_of_book = books
+                        bid_price, ask_price = self.pricing_algorithm.calculate_bid_ask_from_top(best_bid, best_ask)
+                    else:
+                        dydx_orderbook, hl_orderbook = books
+                        bid_price, ask_price = self.pricing_algorithm.calculate_bid_ask(dydx_orderbook)
+                    
+                    # Check if we need to update orders
+                    await self._update_orders(bid_price, ask_price)
+                    
+                    # REST polling checks fills and waits before the next iteration;
+                    # the WebSocket path instead waits for the next book update
+                    if self.orderbook_source == "rest":
+                        await self._check_filled_orders()
+                        await asyncio.sleep(self.loop_interval)
+                    
+                except Exception as e:
+                    logger.error(f"Error in trading loop: {e}")
+                    await asyncio.sleep(self.error_retry_delay)
+        finally:
+            for task in background_tasks:
+                task.cancel()
+            await close_session()
+    
+    async def _fill_check_loop(self):
+        """Check for filled orders once per loop interval, independent of book updates"""
         while self.is_running:
             try:
-                # Get current orderbooks
-                dydx_orderbook = self.dydx_trader.get_orderbook(f"{TRADING_PAIR}-USD")
-                hl_orderbook = self.hl_trader.get_orderbook(TRADING_PAIR)
-                
-                # Calculate new bid/ask prices
-                bid_price, ask_price = self.pricing_algorithm.calculate_bid_ask(dydx_orderbook)
-                
-                # Check if we need to update orders
-                await self._update_orders(bid_price, ask_price)
-                
-                # Check for filled orders
                 await self._check_filled_orders()
-                
-                # Wait before next iteration
-                await asyncio.sleep(1)
-                
             except Exception as e:
-                logger.error(f"Error in trading loop: {e}")
-                await asyncio.sleep(5)
+                logger.error(f"Error checking filled orders: {e}")
+            await asyncio.sleep(self.loop_interval)
+    
+    async def _get_orderbooks(self) -> Optional[Tuple[OrderBook, Optional[OrderBook]]]:
+        """
+        Get current dYdX and Hyperliquid orderbooks
+        Returns: (dydx_orderbook, hl_orderbook), hl_orderbook is None if it could not be fetched;
+                 None if the dYdX feed has no book yet
+        """
+        if self.orderbook_source == "websocket":
+            # Wait for the dYdX book to move (capped so the loop still notices a stop
+            # while the book is quiet); the Hyperliquid book is read from memory
+            await self.dydx_feed.wait_for_update(timeout=self.loop_interval)
+            if not self.dydx_feed.is_ready():
+                return None
+            return self.dydx_feed.snapshot(), self.hl_feed.snapshot()
+        
+        return await self._gather_exchanges(
+            self.dydx_trader.get_orderbook(f"{TRADING_PAIR}-USD"),
+            self.hl_trader.get_orderbook(TRADING_PAIR)
+        )
+    
+    async def _get_top_of_book(self) -> Optional[Tuple[Tuple[float, float], Optional[Tuple[float, float]]]]:
+        """
+        Get current dYdX and Hyperliquid best bid/ask
+        Returns: (dydx_top_of_book, hl_top_of_book), hl_top_of_book is None if it is not available;
+                 None if the dYdX feed has no book yet
+        """
+        if self.orderbook_source == "websocket":
+            await self.dydx_feed.wait_for_update(timeout=self.loop_interval)
+            if not self.dydx_feed.is_ready():
+                return None
+            hl_top_of_book = None
+            if self.hl_feed.is_ready():
+                hl_top_of_book = self.hl_feed.top_of_book()
+            return self.dydx_feed.top_of_book(), hl_top_of_book
+        
+        # Only the best level of each REST response is read
+        return await self._gather_exchanges(
+            self.dydx_trader.get_top_of_book(f"{TRADING_PAIR}-USD"),
+            self.hl_trader.get_top_of_book(TRADING_PAIR)
+        )
+    
+    async def _gather_exchanges(self, dydx_request, hl_request) -> Tuple:
+        """Run a dYdX and a Hyperliquid request concurrently"""
+        dydx_result, hl_result = await asyncio.gather(dydx_request, hl_request, return_exceptions=True)
+        
+        # Quoting needs the dYdX data; a failed Hyperliquid request should not stop it
+        if isinstance(dydx_result, Exception):
+            raise dydx_result
+        if isinstance(hl_result, Exception):
+            logger.warning(f"Continuing without Hyperliquid data: {hl_result}")
+            hl_result = None
+        
+        return dydx_result, hl_result
     
     async def _update_orders(self, bid_price: float, ask_price: float):
         """Update dYdX orders if needed"""
-        # Cancel existing orders if prices have changed significantly
-        price_threshold = 0.001  # 0.1% threshold
+        bid_tick = round(bid_price * self._tick_inverse)
+        ask_tick = round(ask_price * self._tick_inverse)
         
+        # Replace existing orders in one cancel+place transaction if prices have changed significantly
         if self.current_bid_order:
-            current_bid_price = self.current_bid_order.get("price")
-            if abs(bid_price - current_bid_price) / current_bid_price > price_threshold:
+            if abs(bid_tick - self.current_bid_tick) > self._bid_threshold_ticks:
+                current_bid_price = self.current_bid_order.get("price")
                 logger.info(f"Updating bid order: {current_bid_price} -> {bid_price}")
-                self.dydx_trader.cancel_order(self.current_bid_order["order_id"])
-                self.current_bid_order = None
+                self.current_bid_order = self.dydx_trader.replace_order(
+                    self.current_bid_order["order_id"], f"{TRADING_PAIR}-USD", OrderSide.BUY,
+                    self.trade_size, bid_price
+                )
+                self.current_bid_tick = bid_tick
+                self._bid_threshold_ticks = int(bid_tick * self.price_threshold)
         
         if self.current_ask_order:
-            current_ask_price = self.current_ask_order.get("price")
-            if abs(ask_price - current_ask_price) / current_ask_price > price_threshold:
+            if abs(ask_tick - self.current_ask_tick) > self._ask_threshold_ticks:
+                current_ask_price = self.current_ask_order.get("price")
                 logger.info(f"Updating ask order: {current_ask_price} -> {ask_price}")
-                self.dydx_trader.cancel_order(self.current_ask_order["order_id"])
-                self.current_ask_order = None
+                self.current_ask_order = self.dydx_trader.replace_order(
+                    self.current_ask_order["order_id"], f"{TRADING_PAIR}-USD", OrderSide.SELL,
+                    self.trade_size, ask_price
+                )
+                self.current_ask_tick = ask_tick
+                self._ask_threshold_ticks = int(ask_tick * self.price_threshold)
         
-        # Place new orders if needed
+        # Place new orders if none are resting (first iteration or after a fill)
         if not self.current_bid_order:
             self.current_bid_order = self.dydx_trader.place_order(
                 f"{TRADING_PAIR}-USD", OrderSide.BUY, OrderType.LIMIT, 
                 self.trade_size, bid_price
             )
+            self.current_bid_tick = bid_tick
+            self._bid_threshold_ticks = int(bid_tick * self.price_threshold)
             logger.info(f"Placed bid order: {bid_price}")
         
         if not self.current_ask_order:
@@ -288,23 +693,39 @@ class ArbitrageTrader:
                 f"{TRADING_PAIR}-USD", OrderSide.SELL, OrderType.LIMIT, 
                 self.trade_size, ask_price
             )
+            self.current_ask_tick = ask_tick
+            self._ask_threshold_ticks = int(ask_tick * self.price_threshold)
             logger.info(f"Placed ask order: {ask_price}")
     
     async def _check_filled_orders(self):
         """Check if any orders have been filled and execute opposite trades"""
-        if self.current_bid_order:
+        if not self.current_bid_order and not self.current_ask_order:
+            return
+        
+        # One request for all open orders; only tracked orders missing from it need a status
+        # lookup, since a missing order may also be cancelled, expired or not yet indexed
+        open_orders = self.dydx_trader.get_open_orders(f"{TRADING_PAIR}-USD")
+        open_order_ids = {order["order_id"] for order in open_orders}
+        
+        if self.current_bid_order and self.current_bid_order["order_id"] not in open_order_ids:
             status = self.dydx_trader.get_order_status(self.current_bid_order["order_id"])
             if status["status"] == "FILLED":
                 logger.info("Bid order filled, executing sell on Hyperliquid")
                 self.hl_trader.place_market_order(TRADING_PAIR, OrderSide.SELL, self.trade_size)
                 self.current_bid_order = None
+            elif status["status"] in ("CANCELED", "BEST_EFFORT_CANCELED"):
+                logger.info("Bid order cancelled without a fill, re-quoting")
+                self.current_bid_order = None
         
-        if self.current_ask_order:
+        if self.current_ask_order and self.current_ask_order["order_id"] not in open_order_ids:
             status = self.dydx_trader.get_order_status(self.current_ask_order["order_id"])
             if status["status"] == "FILLED":
                 logger.info("Ask order filled, executing buy on Hyperliquid")
                 self.hl_trader.place_market_order(TRADING_PAIR, OrderSide.BUY, self.trade_size)
                 self.current_ask_order = None
+            elif status["status"] in ("CANCELED", "BEST_EFFORT_CANCELED"):
+                logger.info("Ask order cancelled without a fill, re-quoting")
+                self.current_ask_order = None
 
 def main():
     """Main function to run the arbitrage trader"""
@@ -312,7 +733,8 @@ def main():
         # Import configuration
         from config import (
             DYDX_CONFIG, HYPERLIQUID_CONFIG, PRICING_ALGORITHM, 
-            TRADE_SIZE, TRADING_PAIR, LOG_LEVEL, LOG_FILE
+            TRADE_SIZE, TRADING_PAIR, LOG_LEVEL, LOG_FILE, ORDERBOOK_SOURCE,
+            PRICE_UPDATE_THRESHOLD, TICK_SIZE, LOOP_INTERVAL, ERROR_RETRY_DELAY
         )
         
         # Configure logging
@@ -329,6 +751,7 @@ def main():
         logger.info(f"Trading pair: {TRADING_PAIR}")
         logger.info(f"Trade size: {TRADE_SIZE}")
         logger.info(f"Pricing algorithm: {PRICING_ALGORITHM}")
+        logger.info(f"Orderbook source: {ORDERBOOK_SOURCE}")
         
         # Initialize traders
         dydx_trader = DYDXTrader(**DYDX_CONFIG)
@@ -342,7 +765,12 @@ def main():
             dydx_trader=dydx_trader,
             hl_trader=hl_trader,
             pricing_algorithm=pricing_algorithm,
-            trade_size=TRADE_SIZE
+            trade_size=TRADE_SIZE,
+            orderbook_source=ORDERBOOK_SOURCE,
+            price_threshold=PRICE_UPDATE_THRESHOLD,
+            tick_size=TICK_SIZE,
+            loop_interval=LOOP_INTERVAL,
+            error_retry_delay=ERROR_RETRY_DELAY
         )
         
         # Start trading
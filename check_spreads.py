@@ -4,41 +4,54 @@ Print current bid/ask spreads for every perp on
   • dYdX v4 main-net indexer
   • Hyperliquid main-net info endpoint
 
-Dependencies:  requests (pip install requests)
+Dependencies:  httpx[http2], orjson, numpy (pip install "httpx[http2]" orjson numpy)
 """
 
-import requests
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import concurrent.futures as cf
+import asyncio
+import httpx
+import orjson
+import numpy as np
 from typing import Dict, Tuple
 
+MAX_CONCURRENCY = 64      # in-flight streams per exchange on the shared HTTP/2 connection
+
+async def _bounded(sem: asyncio.Semaphore, coro):
+    """Await *coro* while holding *sem*."""
+    async with sem:
+        return await coro
+
 # -------- dYdX helpers -------------------------------------------------------
 DYDX_BASE = "https://indexer.dydx.trade/v4"
+DYDX_TIMEOUT = 4
 
-def _dydx_orderbook(ticker: str) -> float:
-    """Return best-bid, best-ask for one dYdX perp (or None, None on error)."""
-    url = f"{DYDX_BASE}/orderbooks/perpetualMarket/{ticker}"
+async def _dydx_orderbook(client: httpx.AsyncClient, url: str) -> float:
+    """Return best-bid, best-ask for one dYdX perp orderbook URL (or None, None on error)."""
     try:
-        ob = requests.get(url, timeout=4).json()
+        r = await client.get(url, timeout=DYDX_TIMEOUT)
+        r.raise_for_status()
+        ob = orjson.loads(r.content)
         best_bid = float(ob["bids"][0]["price"])
         best_ask = float(ob["asks"][0]["price"])
         return best_bid, best_ask
     except Exception:
         return None, None
 
-def dydx_spreads() -> dict[str, float]:
+async def dydx_spreads(client: httpx.AsyncClient) -> dict[str, float]:
     """Map ticker → spread percentage ((ask-bid)/mid)."""
-    markets = requests.get(f"{DYDX_BASE}/perpetualMarkets", timeout=4).json()["markets"]  # :contentReference[oaicite:0]{index=0}
+    r = await client.get(f"{DYDX_BASE}/perpetualMarkets", timeout=DYDX_TIMEOUT)
+    r.raise_for_status()
+    markets = orjson.loads(r.content)["markets"]  # :contentReference[oaicite:0]{index=0}
     tickers = [m["ticker"] for m in markets.values()]
+    urls = [(t, f"{DYDX_BASE}/orderbooks/perpetualMarket/{t}") for t in tickers]
     spreads = {}
-    with ThreadPoolExecutor(max_workers=8) as pool:
-        futures = {pool.submit(_dydx_orderbook, t): t for t in tickers}
-        for f in as_completed(futures):
-            tkr = futures[f]
-            bid, ask = f.result()
-            if bid is not None and ask is not None:
-                mid = (ask + bid) / 2
-                spreads[tkr] = (ask - bid) / mid
+    sem = asyncio.Semaphore(MAX_CONCURRENCY)
+    results = await asyncio.gather(
+        *(_bounded(sem, _dydx_orderbook(client, url)) for _, url in urls)
+    )
+    for (tkr, _), (bid, ask) in zip(urls, results):
+        if bid is not None and ask is not None:
+            mid = (ask + bid) / 2
+            spreads[tkr] = (ask - bid) / mid
     return spreads
 
 
@@ -48,10 +61,12 @@ HEADERS  = {
     "Content-Type": "application/json",
     "User-Agent"  : "spread-checker/0.1 (+https://github.com/you)"
 }
-def hl_universe() -> list[str]:
-    r = requests.post(HL_BASE, json={"type": "meta"}, headers=HEADERS, timeout=7)
+HL_TIMEOUT = 7
+
+async def hl_universe(client: httpx.AsyncClient) -> list[str]:
+    r = await client.post(HL_BASE, json={"type": "meta"}, headers=HEADERS, timeout=HL_TIMEOUT)
     r.raise_for_status()
-    meta = r.json()                                   # returns {"universe": [...], ...}
+    meta = orjson.loads(r.content)                    # returns {"universe": [...], ...}
     coins = [
         c["name"] for c in meta["universe"]
         if not c.get("isDelisted", False)
@@ -59,37 +74,48 @@ def hl_universe() -> list[str]:
     return coins
 
 # 2️⃣ grab level-2 snapshot for one coin
-def hl_best_bid_ask(coin: str) -> Tuple[float, float] | None:
+async def hl_best_bid_ask(client: httpx.AsyncClient, coin: str) -> Tuple[float, float] | None:
     payload = {"type": "l2Book", "coin": coin}
     try:
-        r = requests.post(HL_BASE, json=payload, headers=HEADERS, timeout=7)
+        r = await client.post(HL_BASE, json=payload, headers=HEADERS, timeout=HL_TIMEOUT)
         r.raise_for_status()
-        data = r.json()
+        data = orjson.loads(r.content)
         # The API returns {"coin": "...", "time": ..., "levels": [bids, asks]}
         bids, asks = data["levels"]                        # Extract bids and asks from levels field
         return float(bids[0]["px"]), float(asks[0]["px"])
     except Exception as e:
         return None
 
-def hl_spreads() -> Dict[str, float]:
+async def hl_spreads(client: httpx.AsyncClient) -> Dict[str, float]:
     spreads = {}
-    coins = hl_universe()
-    with cf.ThreadPoolExecutor(max_workers=8) as pool:
-        for coin, res in zip(coins, pool.map(hl_best_bid_ask, coins)):
-            if res:
-                bid, ask = res
-                mid = (ask + bid) / 2
-                spreads[coin] = (ask - bid) / mid
+    coins = await hl_universe(client)
+    sem = asyncio.Semaphore(MAX_CONCURRENCY)
+    results = await asyncio.gather(
+        *(_bounded(sem, hl_best_bid_ask(client, c)) for c in coins)
+    )
+    for coin, res in zip(coins, results):
+        if res:
+            bid, ask = res
+            mid = (ask + bid) / 2
+            spreads[coin] = (ask - bid) / mid
     return spreads
 
 
 # ------------------------------ main -----------------------------------------
-def find_common_pairs_and_sort():
+async def find_common_pairs_and_sort():
     """Find pairs traded on both exchanges and sort by spread difference (decreasing)"""
-    print("Fetching dYdX spreads...")
-    dydx_data = dydx_spreads()
-    print("Fetching Hyperliquid spreads...")
-    hl_data = hl_spreads()
+    # One HTTP/2 connection per host multiplexes every orderbook request;
+    # failed connection attempts are retried instead of dropping the ticker
+    transport = httpx.AsyncHTTPTransport(
+        http2=True,
+        retries=2,
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=16)
+    )
+    async with httpx.AsyncClient(transport=transport) as client:
+        print("Fetching dYdX and Hyperliquid spreads...")
+        dydx_data, hl_data = await asyncio.gather(
+            dydx_spreads(client), hl_spreads(client)
+        )
     
     # Normalize dYdX pairs by removing "-USD" suffix
     dydx_normalized = {}
@@ -99,37 +125,40 @@ def find_common_pairs_and_sort():
             dydx_normalized[normalized] = spread
     
     # Find common pairs (case-insensitive matching)
-    dydx_lower = {k.lower(): v for k, v in dydx_normalized.items()}
-    hl_lower = {k.lower(): v for k, v in hl_data.items()}
+    # Map lowercase name → original Hyperliquid name (first one wins on collisions)
+    hl_lower_to_orig = {}
+    for k in hl_data:
+        hl_lower_to_orig.setdefault(k.lower(), k)
     
-    common_pairs = []
+    pairs, dydx_common, hl_common = [], [], []
     for dydx_pair, dydx_spread in dydx_normalized.items():
-        hl_pair = None
-        # Try exact match first
+        # Try exact match first, then case-insensitive match
         if dydx_pair in hl_data:
             hl_pair = dydx_pair
-        # Try case-insensitive match
-        elif dydx_pair.lower() in hl_lower:
-            # Find the original case version
-            for k, v in hl_data.items():
-                if k.lower() == dydx_pair.lower():
-                    hl_pair = k
-                    break
+        else:
+            hl_pair = hl_lower_to_orig.get(dydx_pair.lower())
         
         if hl_pair:
-            hl_spread = hl_data[hl_pair]
-            # Calculate difference (dYdX spread - Hyperliquid spread)
-            spread_diff = dydx_spread - hl_spread
-            common_pairs.append({
-                'pair': dydx_pair,
-                'dydx_spread': dydx_spread,
-                'hl_spread': hl_spread,
-                'difference': spread_diff
-            })
+            pairs.append(dydx_pair)
+            dydx_common.append(dydx_spread)
+            hl_common.append(hl_data[hl_pair])
+    
+    # Calculate difference (dYdX spread - Hyperliquid spread) for all pairs at once
+    dydx_arr = np.array(dydx_common, dtype=np.float64)
+    hl_arr = np.array(hl_common, dtype=np.float64)
+    difference = dydx_arr - hl_arr
     
     # Sort by difference in decreasing order (largest differences first)
-    common_pairs.sort(key=lambda x: x['difference'], reverse=True)
-    return common_pairs
+    order = np.argsort(-difference, kind="stable")
+    return [
+        {
+            'pair': pairs[i],
+            'dydx_spread': dydx_common[i],
+            'hl_spread': hl_common[i],
+            'difference': float(difference[i])
+        }
+        for i in order.tolist()
+    ]
 
 if __name__ == "__main__":
     print("=== Common Pairs (sorted by spread difference, decreasing) ===")
@@ -140,7 +169,7 @@ if __name__ == "__main__":
     print("Pair        dYdX Spread%  HL Spread%   Difference")
     print("-" * 55)
     
-    common_pairs = find_common_pairs_and_sort()
+    common_pairs = asyncio.run(find_common_pairs_and_sort())
     
     for pair_info in common_pairs:
         diff_str = f"{pair_info['difference']:+.8f}"  # Show sign
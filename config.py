@@ -6,6 +6,7 @@ Configuration file for the arbitrage trading bot
 TRADING_PAIR = "BRETT"
 TRADE_SIZE = 1.0  # Size of each trade in units
 PRICE_UPDATE_THRESHOLD = 0.001  # 0.1% threshold for updating orders
+TICK_SIZE = 0.00001  # dYdX price tick for the trading pair (tickSize in /v4/perpetualMarkets)
 
 # API Configuration
 DYDX_CONFIG = {
@@ -22,6 +23,9 @@ HYPERLIQUID_CONFIG = {
 # Pricing Algorithm Configuration
 PRICING_ALGORITHM = "best_bid_ask"  # Options: "best_bid_ask", "mid_price_offset"
 
+# Market Data Configuration
+ORDERBOOK_SOURCE = "websocket"  # Options: "websocket", "rest"
+
 # Risk Management
 MAX_POSITION_SIZE = 10.0  # Maximum position size
 MAX_DAILY_TRADES = 100   # Maximum trades per day
@@ -32,5 +36,5 @@ LOG_LEVEL = "INFO"
 LOG_FILE = "arbitrage_trader.log"
 
 # Trading Loop Configuration
-LOOP_INTERVAL = 1.0  # Seconds between trading loop iterations
+LOOP_INTERVAL = 1.0  # Seconds between REST polls; max wait for a WebSocket book update
 ERROR_RETRY_DELAY = 5.0  # Seconds to wait after an error 
\ No newline at end of file
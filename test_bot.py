@@ -6,7 +6,11 @@ This script tests the basic functionality without placing actual orders
 
 import asyncio
 import logging
-from arbitrage_trader import DYDXTrader, HyperliquidTrader, PricingAlgorithm, OrderBook, OrderBookLevel
+import numpy as np
+from arbitrage_trader import (
+    DYDXTrader, HyperliquidTrader, PricingAlgorithm, OrderBook,
+    DYDXOrderBookFeed, HyperliquidOrderBookFeed, ArbitrageTrader, close_session
+)
 from config import DYDX_CONFIG, HYPERLIQUID_CONFIG, TRADING_PAIR
 
 # Configure logging
@@ -24,19 +28,25 @@ async def test_orderbook_fetching():
         
         # Test dYdX orderbook
         logger.info(f"Fetching dYdX orderbook for {TRADING_PAIR}-USD...")
-        dydx_orderbook = dydx_trader.get_orderbook(f"{TRADING_PAIR}-USD")
-        logger.info(f"dYdX orderbook: {len(dydx_orderbook.bids)} bids, {len(dydx_orderbook.asks)} asks")
-        if dydx_orderbook.bids and dydx_orderbook.asks:
-            logger.info(f"dYdX best bid: {dydx_orderbook.bids[0].price}")
-            logger.info(f"dYdX best ask: {dydx_orderbook.asks[0].price}")
+        dydx_orderbook = await dydx_trader.get_orderbook(f"{TRADING_PAIR}-USD")
+        logger.info(f"dYdX orderbook: {dydx_orderbook.bid_px.size} bids, {dydx_orderbook.ask_px.size} asks")
+        if dydx_orderbook.bid_px.size and dydx_orderbook.ask_px.size:
+            logger.info(f"dYdX best bid: {dydx_orderbook.bid_px[0]}")
+            logger.info(f"dYdX best ask: {dydx_orderbook.ask_px[0]}")
         
         # Test Hyperliquid orderbook
         logger.info(f"Fetching Hyperliquid orderbook for {TRADING_PAIR}...")
-        hl_orderbook = hl_trader.get_orderbook(TRADING_PAIR)
-        logger.info(f"Hyperliquid orderbook: {len(hl_orderbook.bids)} bids, {len(hl_orderbook.asks)} asks")
-        if hl_orderbook.bids and hl_orderbook.asks:
-            logger.info(f"Hyperliquid best bid: {hl_orderbook.bids[0].price}")
-            logger.info(f"Hyperliquid best ask: {hl_orderbook.asks[0].price}")
+        hl_orderbook = await hl_trader.get_orderbook(TRADING_PAIR)
+        logger.info(f"Hyperliquid orderbook: {hl_orderbook.bid_px.size} bids, {hl_orderbook.ask_px.size} asks")
+        if hl_orderbook.bid_px.size and hl_orderbook.ask_px.size:
+            logger.info(f"Hyperliquid best bid: {hl_orderbook.bid_px[0]}")
+            logger.info(f"Hyperliquid best ask: {hl_orderbook.ask_px[0]}")
+        
+        # Test top-of-book fast path
+        dydx_best_bid, dydx_best_ask = await dydx_trader.get_top_of_book(f"{TRADING_PAIR}-USD")
+        logger.info(f"dYdX top of book: bid={dydx_best_bid}, ask={dydx_best_ask}")
+        hl_best_bid, hl_best_ask = await hl_trader.get_top_of_book(TRADING_PAIR)
+        logger.info(f"Hyperliquid top of book: bid={hl_best_bid}, ask={hl_best_ask}")
         
         return True
         
@@ -51,9 +61,11 @@ async def test_pricing_algorithms():
     try:
         # Create mock orderbook
         mock_orderbook = OrderBook(
-            bids=[OrderBookLevel(100.0, 1.0), OrderBookLevel(99.9, 2.0)],
-            asks=[OrderBookLevel(100.1, 1.0), OrderBookLevel(100.2, 2.0)],
-            timestamp=0.0
+            bid_px=np.array([100.0, 99.9]),
+            bid_sz=np.array([1.0, 2.0]),
+            ask_px=np.array([100.1, 100.2]),
+            ask_sz=np.array([1.0, 2.0]),
+            timestamp=0
         )
         
         # Test best_bid_ask algorithm
@@ -66,12 +78,134 @@ async def test_pricing_algorithms():
         bid_price, ask_price = pricing_algorithm.calculate_bid_ask(mock_orderbook)
         logger.info(f"Mid price offset strategy: bid={bid_price}, ask={ask_price}")
         
+        # Unknown algorithms are rejected at construction time
+        try:
+            PricingAlgorithm("unknown")
+            logger.error("Unknown pricing algorithm was accepted")
+            return False
+        except ValueError:
+            pass
+        
         return True
         
     except Exception as e:
         logger.error(f"Error testing pricing algorithms: {e}")
         return False
 
+async def test_orderbook_feeds():
+    """Test applying WebSocket orderbook messages with mock data"""
+    logger.info("Testing orderbook feeds...")
+    
+    try:
+        # dYdX: snapshot followed by a delta that removes and adds levels
+        dydx_feed = DYDXOrderBookFeed(f"{TRADING_PAIR}-USD")
+        dydx_feed._handle_message({
+            "type": "subscribed",
+            "contents": {
+                "bids": [{"price": "100.0", "size": "1.0"}, {"price": "99.9", "size": "2.0"}],
+                "asks": [{"price": "100.1", "size": "1.0"}, {"price": "100.2", "size": "2.0"}]
+            }
+        })
+        dydx_feed._handle_message({
+            "type": "channel_data",
+            "contents": {"bids": [["100.0", "0"], ["99.95", "3.0"]], "asks": [["100.05", "1.5"]]}
+        })
+        dydx_orderbook = dydx_feed.snapshot()
+        assert dydx_orderbook.bid_px[0] == 99.95
+        assert dydx_orderbook.ask_px[0] == 100.05
+        assert dydx_feed.top_of_book() == (99.95, 100.05)
+        logger.info(f"dYdX feed: best bid={dydx_orderbook.bid_px[0]}, best ask={dydx_orderbook.ask_px[0]}")
+        
+        # Hyperliquid: every message is a full snapshot
+        hl_feed = HyperliquidOrderBookFeed(TRADING_PAIR)
+        hl_feed._handle_message({
+            "channel": "l2Book",
+            "data": {"coin": TRADING_PAIR, "levels": [
+                [{"px": "100.0", "sz": "1.0", "n": 1}],
+                [{"px": "100.1", "sz": "1.0", "n": 1}]
+            ]}
+        })
+        hl_orderbook = hl_feed.snapshot()
+        assert hl_orderbook.bid_px[0] == 100.0
+        assert hl_orderbook.ask_px[0] == 100.1
+        logger.info(f"Hyperliquid feed: best bid={hl_orderbook.bid_px[0]}, best ask={hl_orderbook.ask_px[0]}")
+        
+        # A dropped connection clears the book so the bot cannot price off stale levels
+        dydx_feed.url = "ws://127.0.0.1:1"  # nothing listens here, so the connect fails
+        feed_task = asyncio.create_task(dydx_feed.run())
+        await asyncio.sleep(0.5)
+        feed_task.cancel()
+        assert not dydx_feed.is_ready()
+        try:
+            dydx_feed.top_of_book()
+            logger.error("Stale orderbook still priced after disconnect")
+            return False
+        except ValueError:
+            logger.info("dYdX feed: book cleared after disconnect")
+        
+        return True
+        
+    except Exception as e:
+        logger.error(f"Error testing orderbook feeds: {e}")
+        return False
+
+async def test_order_update_threshold():
+    """Test the tick-based order update threshold with mock prices (orders are mocked)"""
+    logger.info("Testing order update threshold...")
+    
+    try:
+        def make_trader(algorithm: str) -> ArbitrageTrader:
+            return ArbitrageTrader(
+                dydx_trader=DYDXTrader(**DYDX_CONFIG),
+                hl_trader=HyperliquidTrader(**HYPERLIQUID_CONFIG),
+                pricing_algorithm=PricingAlgorithm(algorithm),
+                orderbook_source="rest",
+                price_threshold=0.001,
+                tick_size=0.01
+            )
+        
+        # On-tick prices: 100.00 is 10000 ticks, so the threshold is 10 ticks
+        trader = make_trader("best_bid_ask")
+        await trader._update_orders(100.00, 100.10)
+        assert trader.current_bid_tick == 10000 and trader._bid_threshold_ticks == 10
+        
+        # A move of exactly the threshold keeps the resting orders
+        await trader._update_orders(100.10, 100.20)
+        assert "replaced_order_id" not in trader.current_bid_order
+        assert "replaced_order_id" not in trader.current_ask_order
+        
+        # One tick more replaces them
+        await trader._update_orders(100.11, 100.21)
+        assert "replaced_order_id" in trader.current_bid_order
+        assert "replaced_order_id" in trader.current_ask_order
+        assert trader.current_bid_tick == 10011 and trader.current_ask_tick == 10021
+        logger.info("On-tick prices: threshold move kept, threshold + 1 tick replaced")
+        
+        # Off-tick prices from mid_price_offset are rounded to the nearest tick:
+        # book 100.00/100.10 -> bid 100.039995 (10004 ticks), ask 100.060005 (10006 ticks),
+        # thresholds int(10004 * 0.001) = int(10006 * 0.001) = 10 ticks
+        trader = make_trader("mid_price_offset")
+        await trader._update_orders(*trader.pricing_algorithm.calculate_bid_ask_from_top(100.00, 100.10))
+        assert trader.current_bid_tick == 10004 and trader.current_ask_tick == 10006
+        assert trader._bid_threshold_ticks == 10 and trader._ask_threshold_ticks == 10
+        
+        # Book 100.10/100.20 -> bid 100.139985 (10014), ask 100.160015 (10016): exactly 10 ticks
+        await trader._update_orders(*trader.pricing_algorithm.calculate_bid_ask_from_top(100.10, 100.20))
+        assert "replaced_order_id" not in trader.current_bid_order
+        assert "replaced_order_id" not in trader.current_ask_order
+        
+        # Book 100.11/100.21 -> bid 100.149984 (10015), ask 100.170016 (10017): 11 ticks
+        await trader._update_orders(*trader.pricing_algorithm.calculate_bid_ask_from_top(100.11, 100.21))
+        assert "replaced_order_id" in trader.current_bid_order
+        assert "replaced_order_id" in trader.current_ask_order
+        logger.info("Off-tick prices: rounded to ticks before the threshold check")
+        
+        return True
+        
+    except Exception as e:
+        logger.error(f"Error testing order update threshold: {e!r}")
+        return False
+
 async def test_spread_calculation():
     """Test spread calculation between exchanges"""
     logger.info("Testing spread calculation...")
@@ -82,17 +216,19 @@ async def test_spread_calculation():
         hl_trader = HyperliquidTrader(**HYPERLIQUID_CONFIG)
         
         # Get orderbooks
-        dydx_orderbook = dydx_trader.get_orderbook(f"{TRADING_PAIR}-USD")
-        hl_orderbook = hl_trader.get_orderbook(TRADING_PAIR)
+        dydx_orderbook, hl_orderbook = await asyncio.gather(
+            dydx_trader.get_orderbook(f"{TRADING_PAIR}-USD"),
+            hl_trader.get_orderbook(TRADING_PAIR)
+        )
         
-        if (dydx_orderbook.bids and dydx_orderbook.asks and 
-            hl_orderbook.bids and hl_orderbook.asks):
+        if (dydx_orderbook.bid_px.size and dydx_orderbook.ask_px.size and 
+            hl_orderbook.bid_px.size and hl_orderbook.ask_px.size):
             
             # Calculate spreads
-            dydx_best_bid = dydx_orderbook.bids[0].price
-            dydx_best_ask = dydx_orderbook.asks[0].price
-            hl_best_bid = hl_orderbook.bids[0].price
-            hl_best_ask = hl_orderbook.asks[0].price
+            dydx_best_bid = dydx_orderbook.bid_px[0]
+            dydx_best_ask = dydx_orderbook.ask_px[0]
+            hl_best_bid = hl_orderbook.bid_px[0]
+            hl_best_ask = hl_orderbook.ask_px[0]
             
             dydx_mid = (dydx_best_bid + dydx_best_ask) / 2
             hl_mid = (hl_best_bid + hl_best_ask) / 2
@@ -124,10 +260,13 @@ async def main():
     tests = [
         test_orderbook_fetching(),
         test_pricing_algorithms(),
+        test_orderbook_feeds(),
+        test_order_update_threshold(),
         test_spread_calculation()
     ]
     
     results = await asyncio.gather(*tests, return_exceptions=True)
+    await close_session()
     
     passed = 0
     total = len(results)